@@ -6,14 +6,21 @@ from .types import (Point, LineString, Polygon,
 
 from .geojson import GeoJSON
 
-from .deserializer import Deserializer, fromfile, fromstring, fromdict
+from .deserializer import (Deserializer, fromfile, fromstring, fromdict,
+                           fromseqfile, iterfromfile)
 
-from .serializer import Serializer, tofile, tostring, todict
+from .serializer import Serializer, tofile, tostring, todict, toseqfile
 
 from .crs import DEFAULTCRS
 
-from . import antimeridian
-from . import orientation
+_LAZY_SUBMODULES = ("antimeridian", "orientation", "transformations")
 
-from . import transformations
+def __getattr__(name):
+    # defer submodule imports (PEP 562) until they are actually accessed
+    if name in _LAZY_SUBMODULES:
+        import importlib
+        mod = importlib.import_module("." + name, __name__)
+        globals()[name] = mod
+        return mod
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
@@ -0,0 +1,72 @@
+# Optional numba-compiled kernels for the numeric hot loops. Importing this
+# module raises ImportError when numba is unavailable, and callers fall back
+# to the pure-Python implementations.
+from numba import njit
+
+@njit(cache=True)
+def signed_area(xy):
+    """ Twice the signed (shoelace) area of the (N, 2) float64 ring *xy*;
+    positive for counterclockwise winding. """
+    area = 0.0
+    for i in range(xy.shape[0] - 1):
+        area += xy[i, 0]*xy[i+1, 1] - xy[i+1, 0]*xy[i, 1]
+    return area
+
+@njit(cache=True)
+def contains(poly0, poly1):
+    """ Does the (N, 2) float64 ring *poly0* contain any vertex of *poly1*?
+    Winding-number test matching antimeridian.contains. """
+    xmin0 = poly0[0, 0]
+    ymin0 = poly0[0, 1]
+    xmax0 = xmin0
+    ymax0 = ymin0
+    for i in range(1, poly0.shape[0]):
+        x = poly0[i, 0]
+        y = poly0[i, 1]
+        if x < xmin0:
+            xmin0 = x
+        elif x > xmax0:
+            xmax0 = x
+        if y < ymin0:
+            ymin0 = y
+        elif y > ymax0:
+            ymax0 = y
+
+    xmin1 = poly1[0, 0]
+    ymin1 = poly1[0, 1]
+    xmax1 = xmin1
+    ymax1 = ymin1
+    for i in range(1, poly1.shape[0]):
+        x = poly1[i, 0]
+        y = poly1[i, 1]
+        if x < xmin1:
+            xmin1 = x
+        elif x > xmax1:
+            xmax1 = x
+        if y < ymin1:
+            ymin1 = y
+        elif y > ymax1:
+            ymax1 = y
+
+    if xmin0 > xmax1 or xmax0 < xmin1 or ymin0 > ymax1 or ymax0 < ymin1:
+        return False
+
+    for k in range(poly1.shape[0]):
+        px = poly1[k, 0]
+        py = poly1[k, 1]
+        wn = 0
+        for i in range(poly0.shape[0] - 1):
+            x0 = poly0[i, 0]
+            y0 = poly0[i, 1]
+            x1 = poly0[i+1, 0]
+            y1 = poly0[i+1, 1]
+            isleft = (x1-x0)*(py-y0) - (px-x0)*(y1-y0) > 0
+            if y0 <= py and py < y1:       # upward crossing
+                if isleft:
+                    wn += 1
+            elif y0 >= py and py > y1:
+                if not isleft:
+                    wn -= 1
+        if wn != 0:
+            return True
+    return False
@@ -1,43 +1,96 @@
 # Implements antimeridian cutting
 import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from . import _numba_helpers
+except ImportError:
+    _numba_helpers = None
+
+try:
+    from rtree.index import Index as _RTreeIndex
+except ImportError:
+    _RTreeIndex = None
+
+from .funcs import thread_workers
+
+# below this hole count, scanning beats building a spatial index
+_RTREE_THRESHOLD = 8
+
+# minimum collection size before threaded cutting can pay off
+_PARALLEL_THRESHOLD = 4096
 from .types import (LineString, MultiLineString,
                     Polygon, MultiPolygon,
                     GeometryCollection,
-                    Feature, FeatureCollection)
+                    Feature, FeatureCollection,
+                    coordinate_array)
 
 PRECISION = 1e-8
 
 def _seg_crosses(x0, x1):
     return abs(x0-x1) > 180
 
+def _quantize8(x):
+    # equivalent to round(x, 8) for latitude-scale values, without the
+    # decimal-formatting roundtrip inside CPython's round()
+    return int(x*1e8 + (0.5 if x >= 0 else -0.5)) * 1e-8
+
 def _split(pt0, pt1):
     # compute offset from antimeridian
     dx0 = float(abs((pt0[0] + 360) % 360 - 180))
     dx1 = float(abs((pt1[0] + 360) % 360 - 180))
-    return round((dx0*pt0[1] + dx1*pt1[1])/(dx0+dx1), 8)
+    return _quantize8((dx0*pt0[1] + dx1*pt1[1])/(dx0+dx1))
 
-def _split_coordinate_string(coordinates):
+def _split_at(coordinates, crossings):
+    # build the split parts by slicing the uncut spans between crossing indices
     parts = []
-    coords = [coordinates[0]]
-    for i in range(len(coordinates)-1):
+    head = None
+    start = 0
+    for i in crossings:
         pt0 = coordinates[i]
         pt1 = coordinates[i+1]
-        if _seg_crosses(pt0[0], pt1[0]):
-            ymerid = _split(pt0, pt1)
-            if pt0[0]>0:
-                # moving east
-                coords.append((180, ymerid))
-            else:
-                coords.append((-180+PRECISION, ymerid))
-            parts.append(coords)
-            if pt0[0]>0:
-                # moving east
-                coords = [(-180+PRECISION, ymerid), pt1]
-            else:
-                coords = [(180, ymerid), pt1]
+        ymerid = _split(pt0, pt1)
+        if pt0[0] > 0:
+            # moving east
+            endpt = (180, ymerid)
+            startpt = (-180+PRECISION, ymerid)
         else:
-            coords.append(pt1)
-    parts.append(coords)
+            endpt = (-180+PRECISION, ymerid)
+            startpt = (180, ymerid)
+        seg = list(coordinates[start:i+1])
+        if head is not None:
+            seg.insert(0, head)
+        seg.append(endpt)
+        parts.append(seg)
+        head = startpt
+        start = i + 1
+    seg = list(coordinates[start:])
+    if head is not None:
+        seg.insert(0, head)
+    parts.append(seg)
+    return parts
+
+def _split_coordinate_string_maybe(coordinates):
+    """ Locate crossings and split in a single pass, returning None when the
+    coordinate string does not cross the antimeridian. """
+    if numpy is not None and len(coordinates) >= _NUMPY_THRESHOLD:
+        xs = coordinate_array(coordinates)[:, 0]
+        crossings = numpy.flatnonzero(numpy.abs(numpy.diff(xs)) > 180)
+    else:
+        crossings = [i for i in range(len(coordinates)-1)
+                     if _seg_crosses(coordinates[i][0], coordinates[i+1][0])]
+    if len(crossings) == 0:
+        return None
+    return _split_at(coordinates, crossings)
+
+def _split_coordinate_string(coordinates):
+    parts = _split_coordinate_string_maybe(coordinates)
+    if parts is None:
+        return [list(coordinates)]
     return parts
 
 def _close_ring(coordinates):
@@ -45,29 +98,55 @@ def _close_ring(coordinates):
         coordinates.append(coordinates[0])
     return coordinates
 
-def _split_ring(ring):
-    parts = _split_coordinate_string(ring)
+def _finish_ring_parts(parts):
     if len(parts) != 1 and parts[0][0] != 180:
         p = parts.pop()
         parts[0].extend(p)
     return [_close_ring(p) for p in parts]
 
+def _split_ring(ring):
+    return _finish_ring_parts(_split_coordinate_string(ring))
+
+_MAX_CACHED_BBOXES = 1024
+_ring_bbox_cache = {}
+
+def _ring_bbox(ring):
+    # (xmin, ymin, xmax, ymax) of a ring, memoized by list identity so that
+    # the O(rings x holes) contains() scans in antimeridian_cut reuse them
+    key = id(ring)
+    entry = _ring_bbox_cache.get(key)
+    if entry is not None and entry[0] is ring:
+        return entry[1]
+    if numpy is not None and len(ring) >= _NUMPY_THRESHOLD:
+        a = coordinate_array(ring)
+        bb = (float(a[:, 0].min()), float(a[:, 1].min()),
+              float(a[:, 0].max()), float(a[:, 1].max()))
+    else:
+        bb = (min(p[0] for p in ring), min(p[1] for p in ring),
+              max(p[0] for p in ring), max(p[1] for p in ring))
+    if len(_ring_bbox_cache) >= _MAX_CACHED_BBOXES:
+        _ring_bbox_cache.clear()
+    _ring_bbox_cache[key] = (ring, bb)
+    return bb
+
 def contains(poly0, poly1):
     """ Does poly0 contain poly1?
     As an initial implementation, returns True if any vertex of poly1 is within
     poly0.
     """
     # check for bounding box overlap
-    bb0 = (min(p[0] for p in poly0), min(p[1] for p in poly0),
-           max(p[0] for p in poly0), max(p[1] for p in poly0))
-    bb1 = (min(p[0] for p in poly1), min(p[1] for p in poly1),
-           max(p[0] for p in poly1), max(p[1] for p in poly1))
+    bb0 = _ring_bbox(poly0)
+    bb1 = _ring_bbox(poly1)
     if ((bb0[0] > bb1[2])
             or (bb0[2] < bb1[0])
             or (bb0[1] > bb1[3])
             or (bb0[3] < bb1[1])):
         return False
 
+    if _numba_helpers is not None:
+        return bool(_numba_helpers.contains(coordinate_array(poly0),
+                                            coordinate_array(poly1)))
+
     # check each vertex
     def _isleft(p, p0, p1):
         return ((p1[0]-p0[0])*(p[1]-p0[1]) - (p[0]-p0[0])*(p1[1]-p0[1])) > 0
@@ -87,10 +166,16 @@ def contains(poly0, poly1):
             return True
     return False
 
+# below this vertex count, numpy call overhead outweighs the vectorized scan
+_NUMPY_THRESHOLD = 32
+
 def _crosses_antimeridian(coordinates):
     """ Determines whether a geometry or feature crosses the antimeridian by
     searching exhaustively.
     """
+    if numpy is not None and len(coordinates) >= _NUMPY_THRESHOLD:
+        xs = coordinate_array(coordinates)[:, 0]
+        return bool(numpy.any(numpy.abs(numpy.diff(xs)) > 180))
     for c0, c1 in zip(coordinates[:-1], coordinates[1:]):
         if _seg_crosses(c0[0], c1[0]):
             return True
@@ -114,34 +199,48 @@ def antimeridian_cut(obj):
     If no split is required, the original argument is returned.
     """
     if isinstance(obj, LineString):
-        if _crosses_antimeridian(obj.coordinates):
-            parts = _split_coordinate_string(obj.coordinates)
+        parts = _split_coordinate_string_maybe(obj.coordinates)
+        if parts is not None:
             return MultiLineString(parts, obj.crs)
         else:
             return obj
     elif isinstance(obj, Polygon):
-        if _crosses_antimeridian(obj.coordinates[0]):
-            outer_rings = _split_ring(obj.coordinates[0])
+        outer_parts = _split_coordinate_string_maybe(obj.coordinates[0])
+        if outer_parts is not None:
+            outer_rings = _finish_ring_parts(outer_parts)
             if len(obj.coordinates) != 1:
-                inner_rings = list(itertools.chain(*[_split_ring(hole)
-                                    for hole in obj.coordinates[1:]]))
+                inner_rings = list(itertools.chain.from_iterable(
+                                    _split_ring(hole)
+                                    for hole in obj.coordinates[1:]))
             else:
                 inner_rings = []
             parts = []
-            for ring in outer_rings:
-                part = [ring]
-                for hole in inner_rings:
-                    if contains(ring, hole):
-                        part.append(hole)
-                parts.append(part)
+            if _RTreeIndex is not None and len(inner_rings) > _RTREE_THRESHOLD:
+                index = _RTreeIndex()
+                for i, hole in enumerate(inner_rings):
+                    index.insert(i, _ring_bbox(hole))
+                for ring in outer_rings:
+                    part = [ring]
+                    for i in sorted(index.intersection(_ring_bbox(ring))):
+                        if contains(ring, inner_rings[i]):
+                            part.append(inner_rings[i])
+                    parts.append(part)
+            else:
+                for ring in outer_rings:
+                    part = [ring]
+                    for hole in inner_rings:
+                        if contains(ring, hole):
+                            part.append(hole)
+                    parts.append(part)
             return MultiPolygon(parts, obj.crs)
         else:
             return obj
     elif isinstance(obj, MultiLineString):
         parts = []
         for ls in obj.coordinates:
-            if _crosses_antimeridian(ls):
-                parts.extend(_split_coordinate_string(ls))
+            split = _split_coordinate_string_maybe(ls)
+            if split is not None:
+                parts.extend(split)
             else:
                 parts.append(ls)
         return MultiLineString(parts, obj.crs)
@@ -155,7 +254,14 @@ def antimeridian_cut(obj):
         return Feature(antimeridian_cut(obj.geometry), obj.properties,
                        obj.id, obj.crs)
     elif isinstance(obj, FeatureCollection):
-        return FeatureCollection([antimeridian_cut(f) for f in obj.features],
-                                 obj.crs)
+        nworkers = thread_workers()
+        if nworkers > 1 and len(obj.features) > _PARALLEL_THRESHOLD:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=nworkers) as pool:
+                features = list(pool.map(antimeridian_cut, obj.features,
+                                         chunksize=256))
+        else:
+            features = [antimeridian_cut(f) for f in obj.features]
+        return FeatureCollection(features, obj.crs)
     else:
         return obj
@@ -1,65 +1,70 @@
 # -*- coding: utf-8 -*-
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from .types import (Point, LineString, Polygon,
+                    MultiPoint, MultiLineString, MultiPolygon,
+                    GeometryCollection, coordinate_array)
+
+# below this vertex count, numpy call overhead outweighs the vectorized reduction
+_NUMPY_THRESHOLD = 16
+
+def _point_bbox(geom):
+    ndim = len(geom.coordinates)
+    return [geom.coordinates[i%ndim] for i in range(2*ndim)]
+
+def _linestring_bbox(geom):
+    return coordstring_bbox(geom.coordinates)
+
+def _polygon_bbox(geom):
+    return coordstring_bbox(geom.coordinates[0])
+
+def _merge_part_bboxes(bbxs):
+    if all(bb is None for bb in bbxs):
+        return None
+
+    return [min(bb[0] for bb in bbxs if bb is not None),
+            min(bb[1] for bb in bbxs if bb is not None),
+            max(bb[2] for bb in bbxs if bb is not None),
+            max(bb[3] for bb in bbxs if bb is not None)]
+
+def _multilinestring_bbox(geom):
+    return _merge_part_bboxes([coordstring_bbox(ls) for ls in geom.coordinates])
+
+def _multipolygon_bbox(geom):
+    return _merge_part_bboxes([coordstring_bbox(poly[0]) for poly in geom.coordinates])
+
 def geom_bbox(geom):
-    if type(geom).__name__ == "Point":
-        ndim = len(geom.coordinates)
-        bbx = [geom.coordinates[i%ndim] for i in range(2*ndim)]
-    elif type(geom).__name__ == "LineString":
-        bbx = coordstring_bbox(geom.coordinates)
-    elif type(geom).__name__ == "Polygon":
-        bbx = coordstring_bbox(geom.coordinates[0])
-    elif type(geom).__name__ == "MultiPoint":
-        bbx = coordstring_bbox(geom.coordinates)
-    elif type(geom).__name__ == "MultiLineString":
-        bbxs = [coordstring_bbox(ls) for ls in geom.coordinates]
-        if all(bb is None for bb in bbxs):
-            return None
-
-        bbx = [min(bb[0] for bb in bbxs if bb is not None),
-               min(bb[1] for bb in bbxs if bb is not None),
-               max(bb[2] for bb in bbxs if bb is not None),
-               max(bb[3] for bb in bbxs if bb is not None)]
-    elif type(geom).__name__ == "MultiPolygon":
-        bbxs = [coordstring_bbox(poly[0]) for poly in geom.coordinates]
-        if all(bb is None for bb in bbxs):
-            return None
-
-        bbx = [min(bb[0] for bb in bbxs if bb is not None),
-               min(bb[1] for bb in bbxs if bb is not None),
-               max(bb[2] for bb in bbxs if bb is not None),
-               max(bb[3] for bb in bbxs if bb is not None)]
-    elif type(geom).__name__ == "GeometryCollection":
-        bbx = geometry_collection_bbox(geom)
-    else:
+    handler = _BBOX_HANDLERS.get(type(geom))
+    if handler is None:
         raise TypeError("type '{}' is not a geometry with a bbox".format(type(geom).__name__))
-    return bbx
+    return handler(geom)
 
 def feature_bbox(feature):
     return geom_bbox(feature.geometry)
 
-def geometry_collection_bbox(coll):
-    bbxs = [geom_bbox(g) for g in coll.geometries]
-    if len(bbxs) == 0 or all(bb is None for bb in bbxs):
+def merge_bboxes(bbxs):
+    """ Reduce a list of bounding boxes (and Nones) to a single enclosing
+    box, or None when there is nothing to merge. """
+    bbxs = [bb for bb in bbxs if bb is not None]
+    if len(bbxs) == 0:
         return None
 
     ndim = len(bbxs[0])//2
     bbx = [0 for _ in range(2*ndim)]
     for dim in range(ndim):
-        bbx[dim] = min(bb[dim] for bb in bbxs if bb is not None)
-        bbx[dim+ndim] = max(bb[dim+ndim] for bb in bbxs if bb is not None)
+        bbx[dim] = min(bb[dim] for bb in bbxs)
+        bbx[dim+ndim] = max(bb[dim+ndim] for bb in bbxs)
     return bbx
 
-def feature_collection_bbox(coll):
-    bbxs = [feature_bbox(feature) for feature in coll.features]
-    if len(bbxs) == 0 or all(bb is None for bb in bbxs):
-        return None
+def geometry_collection_bbox(coll):
+    return merge_bboxes([geom_bbox(g) for g in coll.geometries])
 
-    ndim = len(bbxs[0])//2
-    bbx = [0 for _ in range(2*ndim)]
-    for dim in range(ndim):
-        bbx[dim] = min(bb[dim] for bb in bbxs if bb is not None)
-        bbx[dim+ndim] = max(bb[dim+ndim] for bb in bbxs if bb is not None)
-    return bbx
+def feature_collection_bbox(coll):
+    return merge_bboxes([feature_bbox(feature) for feature in coll.features])
 
 def coordstring_bbox(coordinates):
     """ Given a string of coodinates, return the bounds as a *2×N* length list,
@@ -70,6 +75,10 @@ def coordstring_bbox(coordinates):
     if len(coordinates) == 0:
         return None
 
+    if numpy is not None and len(coordinates) >= _NUMPY_THRESHOLD:
+        a = coordinate_array(coordinates)
+        return a.min(axis=0).tolist() + a.max(axis=0).tolist()
+
     ndim = len(coordinates[0])
     bbx = [0 for _ in range(2*ndim)]
     components = [[a[i] for a in coordinates] for i in range(ndim)]
@@ -78,3 +87,10 @@ def coordstring_bbox(coordinates):
         bbx[i+ndim] = max(comp)
     return bbx
 
+_BBOX_HANDLERS = {Point: _point_bbox,
+                  LineString: _linestring_bbox,
+                  Polygon: _polygon_bbox,
+                  MultiPoint: _linestring_bbox,
+                  MultiLineString: _multilinestring_bbox,
+                  MultiPolygon: _multipolygon_bbox,
+                  GeometryCollection: geometry_collection_bbox}
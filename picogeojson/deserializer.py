@@ -1,7 +1,31 @@
-import copy
+import os
 
-import ujson
+# PICOGEOJSON_JSON pins the JSON backend to "orjson", "ujson", or "json";
+# unset, the fastest available parser is used
+_JSON_BACKEND = os.environ.get("PICOGEOJSON_JSON")
 
+try:
+    if _JSON_BACKEND not in (None, "orjson"):
+        raise ImportError
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    try:
+        if _JSON_BACKEND not in (None, "ujson"):
+            raise ImportError
+        import ujson
+        _loads = ujson.loads
+    except ImportError:
+        import json
+        _loads = json.loads
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+import functools
+import sys
 import typing
 
 from .types import (Point, LineString, Polygon,
@@ -12,8 +36,13 @@ from .crs import DEFAULTCRS
 
 from .geojson import GeoJSON
 
+from .funcs import thread_workers
+
 from .docstrings import docstring_insert
 
+# minimum collection size before threaded parsing can pay off
+_PARALLEL_THRESHOLD = 4096
+
 deserializer_args = """
     Parameters
     ----------
@@ -28,8 +57,8 @@ deserializer_args = """
 
 @docstring_insert(deserializer_args)
 class Deserializer(object):
-    """ Parses GeoJSON strings and returns namedtuples. Strings can be passed
-    by file using deserializer.fromfile() or by value using
+    """ Parses GeoJSON strings and returns geometry objects. Strings can be
+    passed by file using deserializer.fromfile() or by value using
     deserializer.fromstring().
 
     {}"""
@@ -37,6 +66,18 @@ class Deserializer(object):
         if defaultcrs is None:
             defaultcrs = DEFAULTCRS
         self.defaultcrs = defaultcrs
+        self._dispatch = {"Point": self._parsePoint,
+                          "MultiPoint": self._parseMultiPoint,
+                          "LineString": self._parseLineString,
+                          "MultiLineString": self._parseMultiLineString,
+                          "Polygon": self._parsePolygon,
+                          "MultiPolygon": self._parseMultiPolygon,
+                          "GeometryCollection": self._parseGeometryCollection,
+                          "Feature": self._parseFeature,
+                          "FeatureCollection": self._parseFeatureCollection}
+        # (type string, handler) of the last node parsed, stored as one
+        # attribute so concurrent readers never see a mismatched pair
+        self._last = (None, None)
         return
 
     def __call__(self, f):
@@ -46,111 +87,237 @@ class Deserializer(object):
             return self.fromfile(f)
 
     def fromstring(self, s):
-        return self.deserialize(ujson.loads(s))
+        return self.deserialize(_loads(s))
 
     def fromfile(self, f):
         if hasattr(f, 'read'):
-            return self.deserialize(ujson.load(f))
+            return self.deserialize(_loads(f.read()))
         elif hasattr(f, 'open'):
             with f.open() as f:
-                return self.deserialize(ujson.load(f))
-        with open(f) as f:
-            return self.deserialize(ujson.load(f))
+                return self.deserialize(_loads(f.read()))
+        with open(f, 'rb') as f:
+            return self.deserialize(_loads(f.read()))
+
+    def _iterfeatures(self, f):
+        # stream features while watching the surrounding document for a
+        # quantizing "transform" member, whose inversion needs the whole
+        # document and therefore cannot be applied lazily
+        builder = None
+        target = None
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if builder is None:
+                if prefix == "features.item" and event == "start_map":
+                    target = "feature"
+                    builder = ijson.ObjectBuilder()
+                elif prefix == "transform" and event == "start_map":
+                    target = "transform"
+                    builder = ijson.ObjectBuilder()
+                else:
+                    continue
+            builder.event(event, value)
+            if event != "end_map":
+                continue
+            if target == "feature" and prefix == "features.item":
+                yield self._parseFeature(builder.value)
+                builder = None
+            elif target == "transform" and prefix == "transform":
+                tr = builder.value
+                if "scale" in tr and "translate" in tr:
+                    raise ValueError("document carries a quantizing "
+                                     "'transform' member and cannot be "
+                                     "streamed; use fromfile")
+                builder = None
+
+    def iterfeatures(self, f):
+        """ Generator yielding Features from a FeatureCollection document,
+        parsed incrementally so that the whole document is never held in
+        memory. Requires the optional *ijson* package. Raises ValueError on
+        quantized documents (serialized with quantize=True), which must be
+        read with fromfile. """
+        if ijson is None:
+            raise ImportError("streaming parsing requires the ijson package")
+        if hasattr(f, 'read'):
+            for feature in self._iterfeatures(f):
+                yield feature
+        elif hasattr(f, 'open'):
+            with f.open() as f:
+                for feature in self._iterfeatures(f):
+                    yield feature
+        else:
+            with open(f, 'rb') as f:
+                for feature in self._iterfeatures(f):
+                    yield feature
+
+    def _parseseq(self, f):
+        for line in f:
+            if isinstance(line, bytes):
+                line = line.strip(b'\x1e\r\n ')
+            else:
+                line = line.strip('\x1e\r\n ')
+            if line:
+                yield self._deserialize(_untransformed(_loads(line)))
+
+    def fromseqfile(self, f):
+        """ Generator parsing a GeoJSON text sequence (RFC 8142), yielding one
+        GeoJSON object per record. """
+        if hasattr(f, 'read'):
+            for item in self._parseseq(f):
+                yield item
+        elif hasattr(f, 'open'):
+            with f.open() as f:
+                for item in self._parseseq(f):
+                    yield item
+        else:
+            with open(f, 'rb') as f:
+                for item in self._parseseq(f):
+                    yield item
 
     def _parsePoint(self, d):
-        crs = d.get("crs", self.defaultcrs)
+        crs = d["crs"] if "crs" in d else self.defaultcrs
         return Point(d["coordinates"], crs)
 
     def _parseMultiPoint(self, d):
-        crs = d.get("crs", self.defaultcrs)
+        crs = d["crs"] if "crs" in d else self.defaultcrs
         return MultiPoint(d["coordinates"], crs)
 
     def _parseLineString(self, d):
-        crs = d.get("crs", self.defaultcrs)
+        crs = d["crs"] if "crs" in d else self.defaultcrs
         return LineString(d["coordinates"], crs)
 
     def _parseMultiLineString(self, d):
-        crs = d.get("crs", self.defaultcrs)
+        crs = d["crs"] if "crs" in d else self.defaultcrs
         return MultiLineString(d["coordinates"], crs)
 
     def _parsePolygon(self, d):
-        crs = d.get("crs", self.defaultcrs)
-        coords = copy.copy(d["coordinates"])
-        for i, ring in enumerate(coords):
-            if ring[0] != ring[-1]:
-                ring.append(ring[0])
+        crs = d["crs"] if "crs" in d else self.defaultcrs
+        coords = [ring if ring[0] == ring[-1] else ring + [ring[0]]
+                  for ring in d["coordinates"]]
         return Polygon(coords, crs)
 
     def _parseMultiPolygon(self, d):
-        crs = d.get("crs", self.defaultcrs)
-        coords = copy.deepcopy(d["coordinates"])
-        for j, polygon in enumerate(coords):
-            for i, ring in enumerate(polygon):
-                if ring[0] != ring[-1]:
-                    ring.append(ring[0])
+        crs = d["crs"] if "crs" in d else self.defaultcrs
+        coords = [[ring if ring[0] == ring[-1] else ring + [ring[0]]
+                   for ring in polygon]
+                  for polygon in d["coordinates"]]
         return MultiPolygon(coords, crs)
 
     def _parseGeometryCollection(self, o):
-        crs = o.get("crs", self.defaultcrs)
+        crs = o["crs"] if "crs" in o else self.defaultcrs
         geoms = [self._deserialize(g) for g in o["geometries"]]
         return GeometryCollection(geoms, crs)
 
     def _parseFeature(self, o):
-        crs = o.get("crs", self.defaultcrs)
+        crs = o["crs"] if "crs" in o else self.defaultcrs
         geom = self._deserialize(o["geometry"])
         prop = o["properties"]
         fid = o.get("id", None)
         return Feature(geom, prop, fid, crs)
 
     def _parseFeatureCollection(self, o):
-        crs = o.get("crs", self.defaultcrs)
-        features = [self._parseFeature(f) for f in o["features"]]
+        crs = o["crs"] if "crs" in o else self.defaultcrs
+        raw = o["features"]
+        nworkers = thread_workers()
+        if nworkers > 1 and len(raw) > _PARALLEL_THRESHOLD:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=nworkers) as pool:
+                features = list(pool.map(self._parseFeature, raw, chunksize=256))
+        else:
+            features = [self._parseFeature(f) for f in raw]
         return FeatureCollection(features, crs)
 
     def _deserialize(self, d):
-        t = d["type"]
-        if t == "FeatureCollection":
-            raw = self._parseFeatureCollection(d)
-        elif t == "Feature":
-            raw = self._parseFeature(d)
-        elif t == "Point":
-            raw = self._parsePoint(d)
-        elif t == "MultiPoint":
-            raw = self._parseMultiPoint(d)
-        elif t == "LineString":
-            raw = self._parseLineString(d)
-        elif t == "MultiLineString":
-            raw = self._parseMultiLineString(d)
-        elif t == "Polygon":
-            raw = self._parsePolygon(d)
-        elif t == "MultiPolygon":
-            raw = self._parseMultiPolygon(d)
-        elif t == "GeometryCollection":
-            raw = self._parseGeometryCollection(d)
-        else:
+        # interning makes the identity check below hit on every backend;
+        # ujson and the stdlib parser return fresh value strings per node
+        t = sys.intern(d["type"])
+        last_t, last_handler = self._last
+        if t is last_t:
+            return last_handler(d)
+        handler = self._dispatch.get(t)
+        if handler is None:
             raise TypeError("Unrecognized type {0}".format(t))
-        return raw
+        self._last = (t, handler)
+        return handler(d)
 
     def deserialize(self, d):
-        return GeoJSON(self._deserialize(d))
+        return GeoJSON(self._deserialize(_untransformed(d)))
+
+def _untransformed(d):
+    # invert a quantizing "transform" member (see serializer.quantize_transform);
+    # RFC 7946 permits foreign members, so anything else named "transform"
+    # passes through untouched
+    tr = d.get("transform")
+    if isinstance(tr, dict) and "scale" in tr and "translate" in tr:
+        d = _untransform_dict(d, tr["scale"], tr["translate"])
+        d.pop("transform")
+    return d
+
+def _untransform_coords(coords, scale, translate):
+    if len(coords) != 0 and isinstance(coords[0], (list, tuple)):
+        return [_untransform_coords(c, scale, translate) for c in coords]
+    return [c*s + t for c, s, t in zip(coords, scale, translate)]
+
+def _untransform_dict(d, scale, translate):
+    # invert a quantizing "transform" member (see serializer.quantize_transform)
+    # without mutating the caller's dicts
+    t = d["type"]
+    d = dict(d)
+    if t == "FeatureCollection":
+        d["features"] = [_untransform_dict(f, scale, translate)
+                         for f in d["features"]]
+    elif t == "Feature":
+        d["geometry"] = _untransform_dict(d["geometry"], scale, translate)
+    elif t == "GeometryCollection":
+        d["geometries"] = [_untransform_dict(g, scale, translate)
+                           for g in d["geometries"]]
+    else:
+        d["coordinates"] = _untransform_coords(d["coordinates"], scale, translate)
+    return d
+
+@functools.lru_cache(maxsize=32)
+def _cached_deserializer(kw_items):
+    return Deserializer(**dict(kw_items))
+
+def _deserializer(kw):
+    # reuse one Deserializer per kwarg combination; an unhashable value
+    # (e.g. a defaultcrs dict) falls back to a fresh instance
+    try:
+        return _cached_deserializer(tuple(sorted(kw.items())))
+    except TypeError:
+        return Deserializer(**kw)
 
 @docstring_insert(deserializer_args)
 def fromdict(dct: dict, **kw) -> GeoJSON:
     """ Read a dictionary and return the GeoJSON object.
     {} """
-    d = Deserializer(**kw)
+    d = _deserializer(kw)
     return d.deserialize(dct)
 
 @docstring_insert(deserializer_args)
 def fromfile(f: typing.TextIO, **kw) -> GeoJSON:
     """ Read a JSON file and return the GeoJSON object.
     {} """
-    d = Deserializer(**kw)
+    d = _deserializer(kw)
     return d.fromfile(f)
 
 @docstring_insert(deserializer_args)
 def fromstring(s: str, **kw) -> GeoJSON:
     """ Read a JSON string and return the GeoJSON object.
     {} """
-    d = Deserializer(**kw)
-    return d.fromstring(s)
\ No newline at end of file
+    d = _deserializer(kw)
+    return d.fromstring(s)
+
+@docstring_insert(deserializer_args)
+def fromseqfile(f, **kw) -> typing.Iterator:
+    """ Read a GeoJSON text sequence file (RFC 8142), yielding one GeoJSON
+    object per record.
+    {} """
+    d = _deserializer(kw)
+    return d.fromseqfile(f)
+
+@docstring_insert(deserializer_args)
+def iterfromfile(f, **kw) -> typing.Iterator[Feature]:
+    """ Read a FeatureCollection file incrementally, yielding one Feature at a
+    time. Requires the optional *ijson* package.
+    {} """
+    d = _deserializer(kw)
+    return d.iterfeatures(f)
\ No newline at end of file
@@ -1,5 +1,17 @@
+import os
+
 def identity(a):
     return a
 
 def true(a):
-    return True
\ No newline at end of file
+    return True
+
+def thread_workers():
+    """ Number of worker threads requested through the PICOGEOJSON_THREADS
+    environment variable (0 when unset, keeping execution serial and
+    reproducible). """
+    n = os.environ.get("PICOGEOJSON_THREADS")
+    try:
+        return int(n) if n else 0
+    except ValueError:
+        return 0
\ No newline at end of file
@@ -1,6 +1,9 @@
+from collections import deque
 from typing import Iterator
 
-from . import Point, MultiPoint, LineString, MultiLineString, Polygon, MultiPolygon, Feature
+from . import (Point, MultiPoint, LineString, MultiLineString,
+               Polygon, MultiPolygon, GeometryCollection,
+               Feature, FeatureCollection)
 from .types import true
 
 class GeoJSON(object):
@@ -10,14 +13,13 @@ class GeoJSON(object):
         return
 
     def _geometry_getter(self, geom_type):
-        objs = [self.raw]
-        while len(objs) != 0:
+        objs = deque((self.raw,))
+        while objs:
             obj = objs.pop()
-            if type(obj).__name__ == geom_type.__name__:
+            if type(obj) is geom_type:
                 yield obj
-            elif type(obj).__name__ == "GeometryCollection":
-                for geom in obj.geometries:
-                    objs.append(geom)
+            elif type(obj) is GeometryCollection:
+                objs.extend(obj.geometries)
 
     def after(self, func, cond=true):
         return GeoJSON(self.raw.after(func, cond))
@@ -25,16 +27,15 @@ class GeoJSON(object):
     def map(self, func, typ):
         return self.after(
                 func,
-                lambda obj: type(obj).__name__ == typ.__name__,
+                lambda obj: type(obj) is typ,
         )
 
     def map_features(self, func, geometry_type=None, properties=None):
         return self.after(
                 func,
-                lambda obj: type(obj).__name__ == "Feature" and \
-                        (geometry_type is None or type(obj.geometry) == geometry_type.__name__) and \
-                        (properties is None or \
-                            type(obj).__name__ == "Feature" and propmatch(obj.properties, properties)),
+                lambda obj: type(obj) is Feature and \
+                        (geometry_type is None or type(obj.geometry) is geometry_type) and \
+                        (properties is None or propmatch(obj.properties, properties)),
         )
 
     def extract(self, typ, **kw):
@@ -53,17 +54,16 @@ class GeoJSON(object):
         if geometry_type is not None and not isinstance(geometry_type, type):
             raise TypeError("expected str geometry_type, got {}".format(type(geometry_type)))
 
-        objs = [self.raw]
-        while len(objs) != 0:
+        objs = deque((self.raw,))
+        while objs:
             obj = objs.pop()
-            if type(obj).__name__ == "Feature":
+            if type(obj) is Feature:
                 typematch = (geometry_type is None) or \
-                        (type(obj.geometry).__name__ == geometry_type.__name__)
+                        (type(obj.geometry) is geometry_type)
                 if typematch and (properties is None or propmatch(obj.properties, properties)):
                     yield(obj)
-            elif type(obj).__name__ == "FeatureCollection":
-                for feat in obj.features:
-                    objs.append(feat)
+            elif type(obj) is FeatureCollection:
+                objs.extend(obj.features)
 
     @property
     def points(self):
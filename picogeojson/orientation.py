@@ -1,8 +1,32 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from . import _numba_helpers
+except ImportError:
+    _numba_helpers = None
+
+# below this vertex count, numpy call overhead outweighs the vectorized sum
+_NUMPY_THRESHOLD = 32
+
 def _isleft(p, p0, p1) -> bool:
     return ((p1[0]-p0[0])*(p[1]-p0[1]) - (p[0]-p0[0])*(p1[1]-p0[1])) > 0
 
 # ensures that Polygon rings are counter-clockwise
 def is_counterclockwise(ring) -> bool:
+    if numpy is not None and len(ring) >= _NUMPY_THRESHOLD:
+        # vectorized shoelace sum; numpy.asarray rather than the shared
+        # coordinate_array cache because callers may reverse the ring in
+        # place afterward
+        a = numpy.asarray(ring, dtype=numpy.float64)
+        if _numba_helpers is not None:
+            return _numba_helpers.signed_area(a[:, :2]) > 0
+        x = a[:, 0]
+        y = a[:, 1]
+        return float(numpy.sum(x[:-1]*y[1:] - x[1:]*y[:-1])) > 0
+
     incomplete_ring = ring[:-1]
     xmin = incomplete_ring[-1][0]
     ymin = incomplete_ring[-1][1]
@@ -1,12 +1,70 @@
-import ujson
+import functools
+import os
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# PICOGEOJSON_JSON pins the JSON backend to "orjson", "ujson", or "json";
+# unset, the fastest available writer is used
+_JSON_BACKEND = os.environ.get("PICOGEOJSON_JSON")
+
+try:
+    if _JSON_BACKEND not in (None, "orjson"):
+        raise ImportError
+    import orjson
+
+    def _tuple_default(o):
+        if isinstance(o, tuple):
+            return list(o)
+        if numpy is not None:
+            # explicit isinstance checks rather than hasattr/dtype probing:
+            # this hook runs once per unencodable leaf
+            if isinstance(o, numpy.integer):
+                return int(o)
+            if isinstance(o, numpy.floating):
+                return float(o)
+            if isinstance(o, numpy.ndarray):
+                return o.tolist()
+        raise TypeError("{} is not JSON serializable".format(type(o)))
+
+    def _dumps(d):
+        return orjson.dumps(d, option=orjson.OPT_SERIALIZE_NUMPY,
+                            default=_tuple_default).decode()
+
+    # orjson writes contiguous numeric ndarrays straight from the C buffer,
+    # so rounding may hand them through without a tolist() conversion
+    _NATIVE_NDARRAY = True
+except ImportError:
+    _NATIVE_NDARRAY = False
+    try:
+        if _JSON_BACKEND not in (None, "ujson"):
+            raise ImportError
+        import ujson
+
+        def _dumps(d):
+            return ujson.dumps(d, indent=0)
+    except ImportError:
+        import json
+
+        def _dumps(d):
+            return json.dumps(d, separators=(",", ":"))
+
+from .types import (LineString, Polygon, MultiLineString, MultiPolygon,
+                    GeometryCollection, Feature, FeatureCollection)
+
+# multi-vertex geometry types that antimeridian_cut can split; Feature and
+# the collections dispatch to their own asdict handlers before this matters
+_ANTIMERIDIAN_TYPES = (LineString, Polygon, MultiLineString, MultiPolygon)
 
-from .types import GeometryCollection, Feature, FeatureCollection
-
-from .antimeridian import antimeridian_cut
 from .bbox import (geom_bbox, geometry_collection_bbox,
-                   feature_bbox, feature_collection_bbox)
+                   feature_bbox, feature_collection_bbox, merge_bboxes)
+
+from .funcs import identity, thread_workers
 
-from .funcs import identity
+# minimum collection size before threaded serialization can pay off
+_PARALLEL_THRESHOLD = 4096
 
 from .docstrings import docstring_insert
 
@@ -26,6 +84,13 @@ serializer_args = """
 
     precision : int
         If set, restricts the precision after the decimal in the output
+
+    quantize : bool
+        If set, coordinates are written as integers together with a
+        top-level CityJSON-style "transform" member recording the scale and
+        translation required to recover them. Not part of RFC 7946, but
+        roughly three times more compact for large documents (default
+        False). Any "bbox" members remain in CRS units.
     """
 
 @docstring_insert(serializer_args)
@@ -38,71 +103,145 @@ class Serializer(object):
         json_string = serializer(named_tuple)
 
     {}"""
-    def __init__(self, antimeridian_cutting: bool=True, write_bbox: bool=True, write_crs: bool=False, precision: int=None):
+    def __init__(self, antimeridian_cutting: bool=True, write_bbox: bool=True, write_crs: bool=False, precision: int=None, quantize: bool=False):
         self.antimeridian_cutting = antimeridian_cutting
         self.write_bbox = write_bbox
         self.write_crs = write_crs
+        self.quantize = quantize
         if precision is None:
             self.prepare_coords = identity
+            self._prepare_coords_raw = identity
         else:
             self.prepare_coords = lambda cx: fixed_precision(cx, precision)
+            # the string/file paths may hand rounded ndarrays straight to a
+            # backend that writes them natively; todict must receive lists
+            self._prepare_coords_raw = \
+                    lambda cx: fixed_precision(cx, precision, allow_ndarray=True)
+        self._asdict_dispatch = {Feature: self.feature_asdict,
+                                 GeometryCollection: self.geometry_collection_asdict,
+                                 FeatureCollection: self.feature_collection_asdict}
         return
 
     def __call__(self, geom):
-        return ujson.dumps(self.geojson_asdict(geom), indent=0)
-
-    def geojson_asdict(self, geom, root=True):
-
-        if isinstance(geom, Feature):
-            return self.feature_asdict(geom, root=True)
-
-        elif isinstance(geom, GeometryCollection):
-            return self.geometry_collection_asdict(geom, root=True)
-
-        elif isinstance(geom, FeatureCollection):
-            return self.feature_collection_asdict(geom, root=True)
-
-        else:   # bare single geometry
-
-            if self.antimeridian_cutting:
-                if type(geom).__name__ in ("LineString", "Polygon",
-                                           "MultiLineString", "MultiPolygon",
-                                           "GeometryCollection", "Feature",
-                                           "FeatureCollection"):
-                    geom = antimeridian_cut(geom)
-
-            d = {"type": type(geom).__name__,
-                 "coordinates": self.prepare_coords(geom.coordinates)}
+        # quantization works on nested lists, so it cannot take raw ndarrays
+        d = self.geojson_asdict(geom, raw_arrays=not self.quantize)
+        if self.quantize:
+            d = quantize_transform(d)
+        return _dumps(d)
+
+    def geojson_asdict(self, geom, root=True, raw_arrays=False):
+
+        fn = self._asdict_dispatch.get(type(geom))
+        if fn is not None:
+            return fn(geom, root=True, raw_arrays=raw_arrays)
+
+        return self._geometry_asdict(geom, root, raw_arrays)[0]
+
+    def _geometry_asdict(self, geom, root, raw_arrays=False):
+        """ Serialize a bare geometry, returning (dict, bbox). The bbox is
+        the one computed by the antimeridian pre-test when no cut occurred,
+        so callers can reuse it rather than re-walking the coordinates; it is
+        None when it was not computed or is stale. """
+        bb = None
+        if self.antimeridian_cutting and isinstance(geom, _ANTIMERIDIAN_TYPES):
+            # a split requires a segment jumping more than 180 degrees,
+            # which is only possible when the x-range exceeds 180
+            bb = geom_bbox(geom)
+            if bb is None or bb[len(bb)//2] - bb[0] > 180:
+                # deferred so that importing the package does not pull in the
+                # antimeridian module; cuts are rare and the import is cached
+                from .antimeridian import antimeridian_cut
+                geom = antimeridian_cut(geom)
+                bb = None   # the geometry may have changed; recompute
+
+        prepare = self._prepare_coords_raw if raw_arrays else self.prepare_coords
+        d = {"type": type(geom).__name__,
+             "coordinates": prepare(geom.coordinates)}
 
-            if root and self.write_bbox:
+        if root and self.write_bbox:
+            if bb is None:
                 bb = geom_bbox(geom)
-                if bb is not None:
-                    d["bbox"] = self.prepare_coords(bb)
+            if bb is not None:
+                d["bbox"] = self.prepare_coords(bb)
+
+        if root and self.write_crs and (geom.crs is not None):
+            d["crs"] = geom.crs
+        return d, bb
+
+    def dump(self, geom, fobj):
+        """ Serialize *geom* to the open file object *fobj*.
+        FeatureCollections are written one feature at a time, so the dict
+        mirror of the full document is never materialized. """
+        if type(geom) is not FeatureCollection or self.quantize:
+            fobj.write(self(geom))
+            return
+        fobj.write('{"type":"FeatureCollection"')
+        if self.write_bbox:
+            bb = feature_collection_bbox(geom)
+            if bb is not None:
+                fobj.write(',"bbox":')
+                fobj.write(_dumps(bb))
+        if self.write_crs and (geom.crs is not None):
+            fobj.write(',"crs":')
+            fobj.write(_dumps(geom.crs))
+        fobj.write(',"features":[')
+        for i, feature in enumerate(geom.features):
+            if i != 0:
+                fobj.write(",")
+            fobj.write(_dumps(self.feature_asdict(feature, root=False,
+                                                  raw_arrays=True)))
+        fobj.write("]}")
+        return
 
-            if root and self.write_crs and (geom.crs is not None):
-                d["crs"] = geom.crs
-            return d
+    def _feature_asdict_with_bbox(self, feature, raw_arrays=False):
+        """ feature_asdict without the root-only members, returning
+        (dict, bbox). The antimeridian pre-test bbox equals the feature bbox
+        whenever no cut occurred, saving a second pass over the
+        coordinates. """
+        geom = feature.geometry
+        if type(geom) in self._asdict_dispatch:
+            gd = self.geojson_asdict(geom, root=False, raw_arrays=raw_arrays)
+            bb = feature_bbox(feature)
+        else:
+            gd, bb = self._geometry_asdict(geom, False, raw_arrays)
+            if bb is None:
+                bb = feature_bbox(feature)
 
-    def feature_asdict(self, feature: Feature, root: bool=True):
         d = {"type": "Feature",
-             "geometry": self.geojson_asdict(feature.geometry, root=False),
+             "geometry": gd,
              "properties": feature.properties}
 
         if feature.id is not None:
             d["id"] = feature.id
+        return d, bb
 
+    def feature_asdict(self, feature: Feature, root: bool=True, raw_arrays: bool=False):
         if root and self.write_bbox:
-            bb = feature_bbox(feature)
+            d, bb = self._feature_asdict_with_bbox(feature, raw_arrays=raw_arrays)
             if bb is not None:
                 d["bbox"] = bb
+        else:
+            geom = feature.geometry
+            if type(geom) in self._asdict_dispatch:
+                gd = self.geojson_asdict(geom, root=False, raw_arrays=raw_arrays)
+            else:
+                gd = self._geometry_asdict(geom, False, raw_arrays)[0]
+
+            d = {"type": "Feature",
+                 "geometry": gd,
+                 "properties": feature.properties}
+
+            if feature.id is not None:
+                d["id"] = feature.id
 
         if root and self.write_crs and (feature.crs is not None):
             d["crs"] = feature.crs
         return d
 
-    def geometry_collection_asdict(self, coll, root=True):
+    def geometry_collection_asdict(self, coll, root=True, raw_arrays=False):
         d = {"type": "GeometryCollection",
-             "geometries": [self.geojson_asdict(g, root=False)
+             "geometries": [self.geojson_asdict(g, root=False,
+                                                raw_arrays=raw_arrays)
                             for g in coll.geometries]}
 
         if root and self.write_bbox:
@@ -114,51 +253,174 @@ class Serializer(object):
             d["crs"] = coll.crs
         return d
 
-    def feature_collection_asdict(self, coll, root=True):
-        d = {"type": "FeatureCollection",
-             "features": [self.feature_asdict(f, root=False) for f in coll.features]}
+    def feature_collection_asdict(self, coll, root=True, raw_arrays=False):
+        if self.write_bbox:
+            # carry each feature's bbox alongside its dict so the collection
+            # bbox is a merge of corners rather than a second vertex walk
+            fn = functools.partial(self._feature_asdict_with_bbox,
+                                   raw_arrays=raw_arrays)
+        else:
+            fn = functools.partial(self.feature_asdict, root=False,
+                                   raw_arrays=raw_arrays)
+        nworkers = thread_workers()
+        if nworkers > 1 and len(coll.features) > _PARALLEL_THRESHOLD:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=nworkers) as pool:
+                results = list(pool.map(fn, coll.features, chunksize=256))
+        else:
+            results = [fn(f) for f in coll.features]
 
         if self.write_bbox:
-            bb = feature_collection_bbox(coll)
+            d = {"type": "FeatureCollection",
+                 "features": [r[0] for r in results]}
+            bb = merge_bboxes([r[1] for r in results])
             if bb is not None:
                 d["bbox"] = bb
+        else:
+            d = {"type": "FeatureCollection",
+                 "features": results}
 
         if root and self.write_crs and (coll.crs is not None):
             d["crs"] = coll.crs
         return d
 
+@functools.lru_cache(maxsize=32)
+def _cached_serializer(kw_items):
+    return Serializer(**dict(kw_items))
+
+def _serializer(kw):
+    # reuse one Serializer per kwarg combination, so calling tostring in a
+    # loop does not rebuild the dispatch table and precision closure each time
+    try:
+        return _cached_serializer(tuple(sorted(kw.items())))
+    except TypeError:
+        return Serializer(**kw)
+
 @docstring_insert(serializer_args)
 def todict(geom, **kw) -> dict:
     """ Serialize *geom* to a dictionary.
     {} """
-    s = Serializer(**kw)
+    s = _serializer(kw)
     return s.geojson_asdict(geom)
 
 @docstring_insert(serializer_args)
 def tostring(geom, **kw) -> str:
     """ Serialize *geom* to a JSON string.
     {} """
-    s = Serializer(**kw)
+    s = _serializer(kw)
     return s(geom)
 
 @docstring_insert(serializer_args)
 def tofile(geom, f, **kw) -> None:
     """ Serialize *geom* to a file.
     {} """
+    s = _serializer(kw)
+    if hasattr(f, "write"):
+        s.dump(geom, f)
+    elif hasattr(f, "open"):
+        with f.open("w") as fobj:
+            s.dump(geom, fobj)
+    else:
+        with open(f, "w") as fobj:
+            s.dump(geom, fobj)
+
+def _writeseq(geoms, fobj, s):
+    for geom in geoms:
+        fobj.write("\x1e")
+        fobj.write(s(geom))
+        fobj.write("\n")
+
+@docstring_insert(serializer_args)
+def toseqfile(geoms, f, **kw) -> None:
+    """ Serialize an iterable of GeoJSON objects to *f* as a GeoJSON text
+    sequence (RFC 8142).
+    {} """
+    s = _serializer(kw)
     if hasattr(f, "write"):
-        f.write(tostring(geom, **kw))
+        _writeseq(geoms, f, s)
     elif hasattr(f, "open"):
         with f.open("w") as fobj:
-            fobj.write(tostring(geom, **kw))
+            _writeseq(geoms, fobj, s)
     else:
         with open(f, "w") as fobj:
-            fobj.write(tostring(geom, **kw))
+            _writeseq(geoms, fobj, s)
+
+# target resolution of the quantized integer grid
+_QUANT_STEPS = 10**6
+
+def _collect_positions(coords, out):
+    if len(coords) != 0 and isinstance(coords[0], (list, tuple)):
+        for c in coords:
+            _collect_positions(c, out)
+    elif len(coords) != 0:
+        out.append(coords)
+
+def _map_geometry_coords(d, func):
+    t = d["type"]
+    if t == "FeatureCollection":
+        for f in d["features"]:
+            _map_geometry_coords(f, func)
+    elif t == "Feature":
+        _map_geometry_coords(d["geometry"], func)
+    elif t == "GeometryCollection":
+        for g in d["geometries"]:
+            _map_geometry_coords(g, func)
+    else:
+        d["coordinates"] = func(d["coordinates"])
+
+def _quantize_coords(coords, scale, translate):
+    if len(coords) != 0 and isinstance(coords[0], (list, tuple)):
+        return [_quantize_coords(c, scale, translate) for c in coords]
+    return [int(round((c - t)/s)) for c, s, t in zip(coords, scale, translate)]
+
+def quantize_transform(d):
+    """ Rewrite the coordinates of a GeoJSON dict in place as integers and
+    return a dict carrying a "transform" member, such that
+
+        coordinate = integer*scale + translate
+
+    recovers the original values to roughly one part in 10^6 of the
+    document extent. The transform is placed before the other members so
+    that streaming readers see it before any coordinates. """
+    positions = []
+    def collect(coords):
+        _collect_positions(coords, positions)
+        return coords
+    _map_geometry_coords(d, collect)
+    if len(positions) == 0:
+        return d
+
+    ndim = len(positions[0])
+    translate = [min(p[i] for p in positions) for i in range(ndim)]
+    scale = [max((max(p[i] for p in positions) - translate[i])/_QUANT_STEPS, 1.0/_QUANT_STEPS)
+             for i in range(ndim)]
+    _map_geometry_coords(d, lambda cx: _quantize_coords(cx, scale, translate))
+    out = {"transform": {"scale": scale, "translate": translate}}
+    out.update(d)
+    return out
+
+# below this element count, numpy call overhead outweighs vectorized rounding
+_NUMPY_THRESHOLD = 16
 
-def fixed_precision(A, prec=6):
+def fixed_precision(A, prec=6, allow_ndarray=False):
     """ Recursively convert nested iterables or coordinates to nested lists at
-    fixed precision. """
-    if hasattr(A, '__iter__'):
-        return [fixed_precision(el, prec=prec) for el in A]
+    fixed precision. When *allow_ndarray* is set, ndarray input stays an
+    ndarray if the JSON backend writes them natively; callers producing dicts
+    for the user must leave it unset so the output is plain lists. """
+    if numpy is not None and isinstance(A, numpy.ndarray):
+        r = numpy.round(A, prec)
+        return r if (allow_ndarray and _NATIVE_NDARRAY) else r.tolist()
+    if isinstance(A, (list, tuple)):
+        if (numpy is not None and len(A) >= _NUMPY_THRESHOLD
+                and isinstance(A[0], (list, tuple))
+                and not isinstance(A[0][0], (list, tuple))):
+            # regular coordinate string: round the whole block in one pass
+            try:
+                return numpy.round(numpy.asarray(A, dtype=numpy.float64), prec).tolist()
+            except ValueError:
+                pass
+        return [fixed_precision(el, prec=prec, allow_ndarray=allow_ndarray)
+                for el in A]
     else:
         return round(A, prec)
 
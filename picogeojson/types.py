@@ -1,10 +1,32 @@
 import attr
 from collections.abc import Iterable, Sequence
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 from . import validators
 from .orientation import is_counterclockwise
 from .funcs import true
 
+_MAX_CACHED_ARRAYS = 128
+_coord_array_cache = {}
+
+def coordinate_array(coords):
+    """ Return *coords* as a float64 ndarray, memoized by list identity so
+    that the bbox, orientation, and antimeridian kernels operating on the
+    same geometry share one conversion. Requires numpy. """
+    key = id(coords)
+    entry = _coord_array_cache.get(key)
+    if entry is not None and entry[0] is coords:
+        return entry[1]
+    arr = numpy.asarray(coords, dtype=numpy.float64)
+    if len(_coord_array_cache) >= _MAX_CACHED_ARRAYS:
+        _coord_array_cache.clear()
+    _coord_array_cache[key] = (coords, arr)
+    return arr
+
 def as_nested_lists(obj) -> list:
     """ Convert all but the lowest level of iterables to lists. """
     def is_coords(a) -> bool:
@@ -31,17 +53,20 @@ def polygon_converter(obj) -> Sequence:
     """ Ensure that rings are closed and correctly oriented. """
     obj = close_rings_inplace(as_nested_lists(obj))
     for i, ring in enumerate(obj):
-        if bool(i) is is_counterclockwise(ring):
-            obj[i] = ring[::-1]
+        # the outer ring (i == 0) must wind counterclockwise, holes clockwise
+        if (i == 0) != is_counterclockwise(ring):
+            # as_nested_lists returned a fresh ring, so reverse it in place
+            # rather than allocating a reversed copy
+            ring.reverse()
     return obj
 
 def multipolygon_converter(obj) -> Sequence:
     """ Ensure that rings closed and correctly oriented. """
     obj = close_rings_inplace(as_nested_lists(obj))
-    for j, cx in enumerate(obj):
+    for cx in obj:
         for i, ring in enumerate(cx):
-            if bool(i) is is_counterclockwise(ring):
-                obj[j][i] = ring[::-1]
+            if (i == 0) != is_counterclockwise(ring):
+                ring.reverse()
     return obj
 
 class After(object):
@@ -61,6 +86,11 @@ class MultiPoint(After):
     coordinates = attr.ib(repr=False, converter=as_nested_lists, validator=validators.depth2)
     crs = attr.ib(default=None, repr=False)
 
+    @property
+    def coordinates_array(self):
+        """ Coordinates as an (N, ndim) float64 ndarray (requires numpy). """
+        return coordinate_array(self.coordinates)
+
     def transform(self, func):
         return MultiPoint(list(map(func, self.coordinates)), self.crs)
 
@@ -69,6 +99,11 @@ class LineString(After):
     coordinates = attr.ib(repr=False, converter=as_nested_lists, validator=validators.depth2)
     crs = attr.ib(default=None, repr=False)
 
+    @property
+    def coordinates_array(self):
+        """ Coordinates as an (N, ndim) float64 ndarray (requires numpy). """
+        return coordinate_array(self.coordinates)
+
     def transform(self, func):
         return LineString(list(map(func, self.coordinates)), self.crs)
 
@@ -1,5 +1,6 @@
 import json
 import io
+import math
 import os
 import sys
 import unittest
@@ -72,6 +73,19 @@ class DeserializerTests(unittest.TestCase):
             self.assertEqual(pt.coordinates, [100.0, 0.0])
         return
 
+    def test_foreign_transform_member(self):
+        # "transform" is only inverted when it looks like a quantizing
+        # transform; other foreign members of that name are ignored
+        res = pico.fromstring(
+                '{"type": "Point", "coordinates": [1.0, 2.0],'
+                ' "transform": "EPSG:4326"}').raw
+        self.assertEqual(res.coordinates, [1.0, 2.0])
+        res = pico.fromstring(
+                '{"type": "Point", "coordinates": [1.0, 2.0],'
+                ' "transform": {}}').raw
+        self.assertEqual(res.coordinates, [1.0, 2.0])
+        return
+
     def test_point_read(self):
         res = self.deserializer.fromfile(os.path.join(TESTDATA, 'point.json'))
         self.assertEqual(res.raw.coordinates, [100.0, 0.0])
@@ -164,6 +178,68 @@ class DeserializerTests(unittest.TestCase):
                         {"prop0": "value0", "prop1": {"this": "that"}})
         return
 
+    def test_featurecollection_stream(self):
+        try:
+            import ijson
+        except ImportError:
+            raise unittest.SkipTest("ijson not installed")
+        features = list(pico.iterfromfile(os.path.join(TESTDATA, 'featurecollection.json')))
+        self.assertEqual(len(features), 3)
+        self.assertTrue(isinstance(features[0].geometry, pico.Point))
+        self.assertEqual(features[0].geometry.coordinates, [102.0, 0.5])
+        self.assertTrue(isinstance(features[2].geometry, pico.Polygon))
+        return
+
+    def test_featurecollection_parallel(self):
+        import picogeojson.deserializer
+        os.environ["PICOGEOJSON_THREADS"] = "2"
+        saved = picogeojson.deserializer._PARALLEL_THRESHOLD
+        picogeojson.deserializer._PARALLEL_THRESHOLD = 0
+        try:
+            fc = self.deserializer.fromfile(os.path.join(TESTDATA, 'featurecollection.json')).raw
+        finally:
+            picogeojson.deserializer._PARALLEL_THRESHOLD = saved
+            del os.environ["PICOGEOJSON_THREADS"]
+        self.assertEqual(len(fc.features), 3)
+        self.assertEqual(fc.features[0].geometry.coordinates, [102.0, 0.5])
+        return
+
+    def test_textsequence_roundtrip(self):
+        features = [pico.Feature(pico.Point((i, -i), None), {"index": i}, None, None)
+                    for i in range(5)]
+        buf = io.StringIO()
+        pico.toseqfile(features, buf)
+        buf.seek(0)
+        readback = list(pico.fromseqfile(buf))
+        self.assertEqual(len(readback), 5)
+        self.assertEqual(readback[2].geometry.coordinates, [2, -2])
+        self.assertEqual(readback[2].properties, {"index": 2})
+        return
+
+    def test_textsequence_quantized_roundtrip(self):
+        points = [pico.Point((100.5 + i, 40.25 - i)) for i in range(3)]
+        buf = io.StringIO()
+        pico.toseqfile(points, buf, quantize=True)
+        buf.seek(0)
+        readback = list(pico.fromseqfile(buf))
+        self.assertEqual(len(readback), 3)
+        for orig, new in zip(points, readback):
+            self.assertAlmostEqual(new.coordinates[0], orig.coordinates[0], places=4)
+            self.assertAlmostEqual(new.coordinates[1], orig.coordinates[1], places=4)
+        return
+
+    def test_stream_quantized_raises(self):
+        try:
+            import ijson
+        except ImportError:
+            raise unittest.SkipTest("ijson not installed")
+        coll = pico.FeatureCollection(
+                [pico.Feature(pico.Point((100.5, 40.25)), {})])
+        s = pico.tostring(coll, quantize=True)
+        with self.assertRaises(ValueError):
+            list(pico.iterfromfile(io.BytesIO(s.encode())))
+        return
+
 class SerializerTests(unittest.TestCase):
 
     def setUp(self):
@@ -189,6 +265,71 @@ class SerializerTests(unittest.TestCase):
         self.assertEqual(tuple(pt.coordinates), tuple(pt2.coordinates))
         self.assertEqual(pt.crs, pt2.crs)
 
+    def test_feature_bbox_single_walk(self):
+        # the antimeridian pre-test bbox is reused as the feature bbox, so
+        # serializing a root Feature walks its coordinates once
+        calls = []
+        original = bbox.coordstring_bbox
+        def counting(cx):
+            calls.append(1)
+            return original(cx)
+        bbox.coordstring_bbox = counting
+        try:
+            feature = pico.Feature(pico.LineString([(1.0, 1.0), (2.0, 2.0)]), {})
+            d = json.loads(pico.tostring(feature))
+        finally:
+            bbox.coordstring_bbox = original
+        self.assertEqual(d["bbox"], [1.0, 1.0, 2.0, 2.0])
+        self.assertEqual(len(calls), 1)
+        return
+
+    def test_featurecollection_bbox_single_walk(self):
+        # per-feature bboxes are merged into the collection bbox, so each
+        # feature's coordinates are walked once
+        calls = []
+        original = bbox.coordstring_bbox
+        def counting(cx):
+            calls.append(1)
+            return original(cx)
+        bbox.coordstring_bbox = counting
+        try:
+            coll = pico.FeatureCollection(
+                    [pico.Feature(pico.LineString([(i, 0.0), (i, 1.0)]), {"i": i})
+                     for i in range(3)])
+            d = json.loads(pico.tostring(coll))
+        finally:
+            bbox.coordstring_bbox = original
+        self.assertEqual(d["bbox"], [0.0, 0.0, 2.0, 1.0])
+        self.assertEqual(len(calls), 3)
+        return
+
+    def test_featurecollection_parallel_serialize(self):
+        import picogeojson.serializer
+        coll = pico.FeatureCollection(
+                [pico.Feature(pico.Point((i, i)), {"i": i}) for i in range(5)])
+        expected = json.loads(pico.tostring(coll))
+        os.environ["PICOGEOJSON_THREADS"] = "2"
+        saved = picogeojson.serializer._PARALLEL_THRESHOLD
+        picogeojson.serializer._PARALLEL_THRESHOLD = 0
+        try:
+            threaded = json.loads(pico.tostring(coll))
+        finally:
+            picogeojson.serializer._PARALLEL_THRESHOLD = saved
+            del os.environ["PICOGEOJSON_THREADS"]
+        self.assertEqual(threaded, expected)
+        return
+
+    def test_featurecollection_stream_write(self):
+        # FeatureCollections are written feature-by-feature; the result must
+        # match the all-at-once serialization
+        coll = pico.FeatureCollection(
+                [pico.Feature(pico.Point((i, i)), {"i": i}) for i in range(5)])
+        f = io.StringIO()
+        pico.tofile(coll, f, write_crs=True)
+        self.assertEqual(json.loads(f.getvalue()),
+                         json.loads(pico.tostring(coll, write_crs=True)))
+        f.close()
+
     def test_todict(self):
         geom = pico.Feature(pico.Polygon([[(0, 0), (1, 0), (1, 1), (0, 1), (0, 0)]]),
                             {"cover": "water", "color": "blue"})
@@ -315,6 +456,23 @@ class SerializerTests(unittest.TestCase):
         self.assertEqual(d.get("properties", {}).get("type", ""), "city")
         return
 
+    def test_quantize_roundtrip(self):
+        poly = pico.Polygon([[(100.0, 0.0), (101.0, 0.0), (101.0, 1.0),
+                              (100.0, 1.0), (100.0, 0.0)]])
+        s = pico.tostring(poly, quantize=True)
+        d = json.loads(s)
+        self.assertTrue("transform" in d)
+        self.assertTrue(all(isinstance(x, int)
+                            for ring in d["coordinates"]
+                            for pt in ring
+                            for x in pt))
+        back = pico.fromstring(s).raw
+        for ring_out, ring_in in zip(back.coordinates, poly.coordinates):
+            for pt_out, pt_in in zip(ring_out, ring_in):
+                self.assertAlmostEqual(pt_out[0], pt_in[0], places=4)
+                self.assertAlmostEqual(pt_out[1], pt_in[1], places=4)
+        return
+
     def test_serialize_featurecollection(self):
         collection = pico.FeatureCollection(
                 [pico.Feature(pico.Point((7,3), None), {"type": "city"}, None, None),
@@ -373,6 +531,17 @@ class SerializerTests(unittest.TestCase):
         self.assertEqual((44.123, 17.099), tuple(d["coordinates"]))
         return
 
+    def test_todict_precision_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            raise unittest.SkipTest("numpy not installed")
+        pt = pico.Point(numpy.array([44.1234567, 17.0987654]))
+        d = pico.todict(pt, precision=3)
+        self.assertIsInstance(d["coordinates"], list)
+        self.assertEqual([44.123, 17.099], d["coordinates"])
+        return
+
     def test_serialize_precision_bbox(self):
         ls = pico.LineString([(-1.1111111, 2.2222222), (3.3333333, -7.7777777)])
         ser = Serializer(precision=3, write_bbox=True)
@@ -384,6 +553,12 @@ class SerializerTests(unittest.TestCase):
 
 class AntimerdianTests(unittest.TestCase):
 
+    def test_quantize(self):
+        for y in (45.123456789, -67.987654321, 0.0, 89.99999999,
+                  36.333333333333336, -0.000000005, 179.999999994):
+            self.assertEqual(pico.antimeridian._quantize8(y), round(y, 8))
+        return
+
     def test_contains(self):
         self.assertFalse(pico.antimeridian.contains(
             [(0, 0), (0, 1), (1, 1), (1, 0), (0, 0)],
@@ -461,6 +636,14 @@ class OrientationTests(unittest.TestCase):
         self.assertFalse(pico.orientation.is_counterclockwise(
             [(0, 0), (0, 1), (1, 1), (1, 0), (0, 0)]))
 
+    def test_isccw_large(self):
+        # exercises the vectorized shoelace path when numpy is available
+        t = [2*math.pi*i/100 for i in range(100)]
+        ccw = [(math.cos(a), math.sin(a)) for a in t]
+        ccw.append(ccw[0])
+        self.assertTrue(pico.orientation.is_counterclockwise(ccw))
+        self.assertFalse(pico.orientation.is_counterclockwise(ccw[::-1]))
+
 class BboxTests(unittest.TestCase):
 
     def test_coordinate_bbox_2d(self):